@@ -3,6 +3,7 @@
 
 from datetime import datetime
 from scripts.read_google_sheet import read_google_sheet
+from scripts.roster_ingest import ingest_roster
 from firebase_admin import firestore
 
 try:
@@ -25,57 +26,41 @@ def sync_members_from_sheet():
         if df is None:
             print("⚠ No data returned from sheet; skipping sync")
             return 0
-        df.columns = df.columns.str.strip()
+        records = ingest_roster(df)
         synced_count = 0
-        for idx, row in df.iterrows():
+        parent_docs = {}
+        for rec in records:
             try:
-                full_name = (row.get('Full Name', row.get('Name', '')) or '').strip()
-                email     = (row.get('Email Address', row.get('Email ID', '')) or '').strip()
-                dept      = (row.get('Department', 'AIML') or 'AIML').strip()
-                section   = (row.get('Section', 'A') or 'A').strip()
-                team_name = (row.get('Team Name', 'ByteBreakers') or 'ByteBreakers').strip()
-                team_lead = (row.get('Team Lead', '') or '').strip()
-                batch     = (row.get('Batch', '') or '').strip()
-                if not full_name:
-                    continue
-                if not team_lead:
-                    print(f"⚠ Skipping {full_name} - no team lead assigned")
-                    continue
-                base_team_name    = team_name
-                team_display_name = f"{team_name} - {team_lead}"
-                team_id           = f"{team_name}_{team_lead}".replace(' ', '_')
-                dept_id    = dept.upper()
-                section_id = f"Section_{section.upper()}"
-                member_id  = full_name.replace(' ', '_')
-                dept_ref = db.collection('departments').document(dept_id)
-                dept_ref.set({'name': f'{dept} Department', 'updated_at': datetime.now()}, merge=True)
-                section_ref = dept_ref.collection('sections').document(section_id)
-                section_ref.set({'name': f'Section {section}', 'updated_at': datetime.now()}, merge=True)
-                team_ref = section_ref.collection('teams').document(team_id)
-                team_ref.set({'name': team_display_name, 'base_team_name': base_team_name, 'team_lead_name': team_lead, 'updated_at': datetime.now()}, merge=True)
-                is_actual_lead = (full_name.lower() == team_lead.lower())
-                member_ref = team_ref.collection('members').document(member_id)
-                member_ref.set({
-                    'name': full_name,
-                    'email': email,
-                    'assigned_team_lead': team_lead,
-                    'is_team_lead': is_actual_lead,
-                    'assigned_batch': batch or None,
-                    'profiles': {
-                        'leetcode_url': (row.get('LeetCode Profile URL', row.get('LeetCode ID (eg: Gfz6n0WdOg or https://leetcode.com/u/Gfz6n0WdOg/)', '')) or '').strip(),
-                        'skillrack_url': (row.get('SkillRack Profile URL', row.get('Skillrack Profile URL', '')) or '').strip(),
-                        'codechef_url': (row.get('CodeChef Profile URL', '') or '').strip(),
-                        'hackerrank_url': (row.get('HackerRank Profile URL', row.get('Hackerrank Profile URL', '')) or '').strip(),
-                        'github_url': (row.get('GitHub Profile URL', '') or '').strip()
-                    },
+                dept_ref = db.collection('departments').document(rec.dept_id)
+                section_ref = dept_ref.collection('sections').document(rec.section_id)
+                team_ref = section_ref.collection('teams').document(rec.team_id)
+                # Parent docs are shared by many members; the last row reaching each one wins
+                parent_docs[dept_ref.path] = (dept_ref, {'name': f'{rec.dept} Department'})
+                parent_docs[section_ref.path] = (section_ref, {'name': f'Section {rec.section}'})
+                parent_docs[team_ref.path] = (team_ref, {'name': rec.team_display_name, 'base_team_name': rec.team_name, 'team_lead_name': rec.team_lead})
+                member_ref = team_ref.collection('members').document(rec.member_id)
+                member_data = {
+                    'name': rec.full_name,
+                    'email': rec.email,
+                    'assigned_team_lead': rec.team_lead,
+                    'is_team_lead': rec.is_team_lead,
+                    'assigned_batch': rec.batch or None,
+                    'profiles': rec.profiles(),
+                    'usernames': rec.usernames(),
                     'last_synced': datetime.now()
-                }, merge=True)
-                role_display = "LEADER" if is_actual_lead else f"under {team_lead}"
-                batch_display = f" • Batch {batch}" if batch else ""
-                print(f"✅ Synced: {full_name} → {dept}/{section}/{team_display_name} ({role_display}){batch_display}")
+                }
+                member_ref.set(member_data, merge=True)
+                role_display = "LEADER" if rec.is_team_lead else f"under {rec.team_lead}"
+                batch_display = f" • Batch {rec.batch}" if rec.batch else ""
+                print(f"✅ Synced: {rec.full_name} → {rec.dept}/{rec.section}/{rec.team_display_name} ({role_display}){batch_display}")
                 synced_count += 1
             except Exception as e:
-                print(f"❌ Error syncing row {idx+1}: {e}")
+                print(f"❌ Error syncing {rec.full_name}: {e}")
+        for ref, payload in parent_docs.values():
+            try:
+                ref.set({**payload, 'updated_at': datetime.now()}, merge=True)
+            except Exception as e:
+                print(f"❌ Error syncing {ref.path}: {e}")
         print(f"\n📊 Synced {synced_count} members")
         return synced_count
     except Exception as e:
@@ -0,0 +1,97 @@
+"""Benchmarks roster ingestion against the old per-row iterrows loop.
+
+Usage: python scripts/bench_roster_ingest.py [rows ...]   (default: 10000 50000)
+"""
+import os
+import sys
+import time
+from random import Random
+
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from scripts.roster_ingest import ingest_roster  # noqa: E402
+
+LEETCODE_HEADER = 'LeetCode ID (eg: Gfz6n0WdOg or https://leetcode.com/u/Gfz6n0WdOg/)'
+
+
+def make_sheet(n_rows: int, seed: int = 7) -> pd.DataFrame:
+    """Synthetic registration sheet shaped like get_all_records() output."""
+    rnd = Random(seed)
+    rows = []
+    for i in range(n_rows):
+        # ~5% re-submissions so dedup has work to do
+        uid = rnd.randrange(i) if i and rnd.random() < 0.05 else i
+        lead = f"Lead {uid % 200}"
+        rows.append({
+            'Full Name': f" Student {uid} ",
+            'Email Address': f"student{uid}@example.com",
+            'Department': rnd.choice(['AIML', 'CSE', 'ECE', '']),
+            'Section': rnd.choice(['A', 'B', 'C']),
+            'Team Name': f"Team {uid % 50}",
+            'Team Lead': lead if rnd.random() > 0.01 else '',
+            'Batch': rnd.choice([2024, 2025, '']),
+            LEETCODE_HEADER: rnd.choice([f"https://leetcode.com/u/s{uid}/", f"s{uid}", '']),
+            'Skillrack Profile URL': rnd.choice([
+                f"https://www.skillrack.com/faces/resume.xhtml?id={uid}",
+                f"https://skillrack.gururaja.in/s{uid} https://skillrack.gururaja.in/s{uid}",
+                '',
+            ]),
+            'CodeChef Profile URL': f"https://www.codechef.com/users/s{uid}",
+            'Hackerrank Profile URL': rnd.choice([f"https://www.hackerrank.com/profile/s{uid}%20", '']),
+            'GitHub Profile URL': f"https://github.com/s{uid}/",
+        })
+    return pd.DataFrame(rows)
+
+
+def iterrows_baseline(df: pd.DataFrame) -> int:
+    """The pre-ingestion per-row normalization, minus the Firestore writes."""
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    count = 0
+    for _, row in df.iterrows():
+        full_name = (row.get('Full Name', row.get('Name', '')) or '').strip()
+        _email    = (row.get('Email Address', row.get('Email ID', '')) or '').strip()
+        _dept     = (row.get('Department', 'AIML') or 'AIML').strip()
+        _section  = (row.get('Section', 'A') or 'A').strip()
+        _team     = (row.get('Team Name', 'ByteBreakers') or 'ByteBreakers').strip()
+        team_lead = (row.get('Team Lead', '') or '').strip()
+        _batch    = str(row.get('Batch', '') or '').strip()
+        if not full_name or not team_lead:
+            continue
+        _profiles = {
+            'leetcode_url': (row.get('LeetCode Profile URL', row.get(LEETCODE_HEADER, '')) or '').strip(),
+            'skillrack_url': (row.get('SkillRack Profile URL', row.get('Skillrack Profile URL', '')) or '').strip(),
+            'codechef_url': (row.get('CodeChef Profile URL', '') or '').strip(),
+            'hackerrank_url': (row.get('HackerRank Profile URL', row.get('Hackerrank Profile URL', '')) or '').strip(),
+            'github_url': (row.get('GitHub Profile URL', '') or '').strip(),
+        }
+        count += 1
+    return count
+
+
+def _timed(fn, df):
+    start = time.perf_counter()
+    result = fn(df)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 50_000]
+    # Silence the per-row "no team lead" warnings while timing
+    real_stdout = sys.stdout
+    for n in sizes:
+        sheet = make_sheet(n)
+        sys.stdout = open(os.devnull, 'w')
+        try:
+            base_count, base_s = _timed(iterrows_baseline, sheet)
+            records, ingest_s = _timed(ingest_roster, sheet)
+        finally:
+            sys.stdout.close()
+            sys.stdout = real_stdout
+        print(f"📊 {n:>7} rows | iterrows: {base_s*1000:8.1f} ms ({base_count} rows kept) "
+              f"| ingest_roster: {ingest_s*1000:8.1f} ms ({len(records)} members) "
+              f"| {base_s / ingest_s:5.1f}x")
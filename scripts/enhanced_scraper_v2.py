@@ -15,6 +15,8 @@ from firebase_admin import credentials, firestore
 
 import google.generativeai as genai
 from scripts.read_google_sheet import read_google_sheet
+from scripts.roster_ingest import ingest_roster
+from scripts.history_store import HistoryStore, backfill_from_firestore
 
 # ===================== ENV & SECRETS =====================
 load_dotenv()
@@ -400,64 +402,51 @@ def sync_members_from_sheet():
     print("🔄 Syncing members from Google Sheet...")
     try:
         df = read_google_sheet("team_registration_responses")
-        df.columns = df.columns.str.strip()
+        if df is None:
+            print("⚠ No data returned from sheet; skipping sync")
+            return 0
+        records = ingest_roster(df)
         synced_count = 0
-        for idx, row in df.iterrows():
+        parent_docs = {}
+        for rec in records:
             try:
-                full_name = (row.get('Full Name', row.get('Name', '')) or '').strip()
-                email     = (row.get('Email Address', row.get('Email ID', '')) or '').strip()
-                dept      = (row.get('Department', 'AIML') or 'AIML').strip()
-                section   = (row.get('Section', 'A') or 'A').strip()
-                team_name = (row.get('Team Name', 'ByteBreakers') or 'ByteBreakers').strip()
-                team_lead = (row.get('Team Lead', '') or '').strip()
-                batch     = (row.get('Batch', '') or '').strip()
-                if not full_name:
-                    continue
-                if not team_lead:
-                    print(f"⚠ Skipping {full_name} - no team lead assigned")
-                    continue
-                base_team_name    = team_name
-                team_display_name = f"{team_name} - {team_lead}"
-                team_id           = f"{team_name}_{team_lead}".replace(' ', '_')
-                dept_id    = dept.upper()
-                section_id = f"Section_{section.upper()}"
-                member_id  = full_name.replace(' ', '_')
-                dept_ref = db.collection('departments').document(dept_id)
-                dept_ref.set({'name': f'{dept} Department', 'updated_at': datetime.now()}, merge=True)
-                section_ref = dept_ref.collection('sections').document(section_id)
-                section_ref.set({'name': f'Section {section}', 'updated_at': datetime.now()}, merge=True)
-                team_ref = section_ref.collection('teams').document(team_id)
-                team_ref.set({'name': team_display_name, 'base_team_name': base_team_name, 'team_lead_name': team_lead, 'updated_at': datetime.now()}, merge=True)
-                is_actual_lead = (full_name.lower() == team_lead.lower())
-                member_ref = team_ref.collection('members').document(member_id)
+                dept_ref = db.collection('departments').document(rec.dept_id)
+                section_ref = dept_ref.collection('sections').document(rec.section_id)
+                team_ref = section_ref.collection('teams').document(rec.team_id)
+                # Parent docs are shared by many members; the last row reaching each one wins
+                parent_docs[dept_ref.path] = (dept_ref, {'name': f'{rec.dept} Department'})
+                parent_docs[section_ref.path] = (section_ref, {'name': f'Section {rec.section}'})
+                parent_docs[team_ref.path] = (team_ref, {'name': rec.team_display_name, 'base_team_name': rec.team_name, 'team_lead_name': rec.team_lead})
+                member_ref = team_ref.collection('members').document(rec.member_id)
                 member_data = {
-                    'name': full_name,
-                    'email': email,
-                    'assigned_team_lead': team_lead,
-                    'is_team_lead': is_actual_lead,
-                    'assigned_batch': batch or None,
-                    'profiles': {
-                        'leetcode_url': (row.get('LeetCode Profile URL', row.get('LeetCode ID (eg: Gfz6n0WdOg or https://leetcode.com/u/Gfz6n0WdOg/)', '')) or '').strip(),
-                        'skillrack_url': (row.get('SkillRack Profile URL', row.get('Skillrack Profile URL', '')) or '').strip(),
-                        'codechef_url': (row.get('CodeChef Profile URL', '') or '').strip(),
-                        'hackerrank_url': (row.get('HackerRank Profile URL', row.get('Hackerrank Profile URL', '')) or '').strip(),
-                        'github_url': (row.get('GitHub Profile URL', '') or '').strip()
-                    },
+                    'name': rec.full_name,
+                    'email': rec.email,
+                    'assigned_team_lead': rec.team_lead,
+                    'is_team_lead': rec.is_team_lead,
+                    'assigned_batch': rec.batch or None,
+                    'profiles': rec.profiles(),
+                    'usernames': rec.usernames(),
                     'last_synced': datetime.now()
                 }
                 member_ref.set(member_data, merge=True)
-                role_display = "LEADER" if is_actual_lead else f"under {team_lead}"
-                batch_display = f" • Batch {batch}" if batch else ""
-                print(f"✅ Synced: {full_name} → {dept}/{section}/{team_display_name} ({role_display}){batch_display}")
+                role_display = "LEADER" if rec.is_team_lead else f"under {rec.team_lead}"
+                batch_display = f" • Batch {rec.batch}" if rec.batch else ""
+                print(f"✅ Synced: {rec.full_name} → {rec.dept}/{rec.section}/{rec.team_display_name} ({role_display}){batch_display}")
                 synced_count += 1
             except Exception as e:
-                print(f"❌ Error syncing row {idx+1}: {e}")
+                print(f"❌ Error syncing {rec.full_name}: {e}")
+        for ref, payload in parent_docs.values():
+            try:
+                ref.set({**payload, 'updated_at': datetime.now()}, merge=True)
+            except Exception as e:
+                print(f"❌ Error syncing {ref.path}: {e}")
         print(f"\n📊 Synced {synced_count} members")
         return synced_count
     except Exception as e:
         print(f"❌ Error reading Google Sheet: {e}")
         return 0
 
+
 # ===================== MAIN SCRAPING =====================
 
 def scrape_all_teams():
@@ -467,75 +456,79 @@ def scrape_all_teams():
     sync_members_from_sheet()
     from_email = GMAIL_FROM_EMAIL
     app_password = GMAIL_APP_PASSWORD
-    departments = db.collection('departments').stream()
-    total_members_scraped = 0
-    for dept_doc in departments:
-        dept_id = dept_doc.id
-        print(f"\n📚 Department: {dept_id}")
-        sections = dept_doc.reference.collection('sections').stream()
-        for section_doc in sections:
-            section_id = section_doc.id
-            print(f"  📂 Section: {section_id}")
-            teams = section_doc.reference.collection('teams').stream()
-            for team_doc in teams:
-                team_id = team_doc.id
-                print(f"    👥 Team: {team_id}")
-                members = team_doc.reference.collection('members').stream()
-                for member_doc in members:
-                    member_data = member_doc.to_dict()
-                    member_id   = member_doc.id
-                    name        = member_data.get('name', member_id)
-                    email       = member_data.get('email', '')
-                    profiles    = member_data.get('profiles', {})
-                    print(f"      👤 Scraping {name}...")
-                    lc_total = get_leetcode_total(profiles.get('leetcode_url', ''));    time.sleep(uniform(1.0, 2.0))
-                    # Prevent SkillRack regressions and add mirror fallback
-                    today = datetime.now().strftime("%Y-%m-%d")
-                    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-                    last_known_sr = 0
-                    try:
-                        y_doc_tmp = member_doc.reference.collection('daily_totals').document(yesterday).get()
-                        if y_doc_tmp.exists:
-                            last_known_sr = int(y_doc_tmp.to_dict().get('skillrack_total', 0))
-                    except Exception:
-                        pass
-                    sr_total = get_skillrack_total_resilient(profiles.get('skillrack_url', ''), last_known=last_known_sr); time.sleep(uniform(1.0, 2.0))
-                    cc_total = get_codechef_solved(profiles.get('codechef_url', ''));  time.sleep(uniform(1.0, 2.0))
-                    hr_total = get_hackerrank_solved(profiles.get('hackerrank_url', '')); time.sleep(uniform(1.0, 2.0))
-                    gh_repos = get_github_repo_count(profiles.get('github_url', ''))
-                    print(f"         LC: {lc_total} | SR: {sr_total} | CC: {cc_total} | HR: {hr_total} | GH: {gh_repos}")
-                    lc_diff = sr_diff = cc_diff = hr_diff = gh_diff = 0
-                    try:
-                        y_doc = member_doc.reference.collection('daily_totals').document(yesterday).get()
-                        if y_doc.exists:
-                            y_data = y_doc.to_dict()
+    with HistoryStore() as history:
+        backfill_from_firestore(db, history)
+        departments = db.collection('departments').stream()
+        total_members_scraped = 0
+        for dept_doc in departments:
+            dept_id = dept_doc.id
+            print(f"\n📚 Department: {dept_id}")
+            sections = dept_doc.reference.collection('sections').stream()
+            for section_doc in sections:
+                section_id = section_doc.id
+                print(f"  📂 Section: {section_id}")
+                teams = section_doc.reference.collection('teams').stream()
+                for team_doc in teams:
+                    team_id = team_doc.id
+                    print(f"    👥 Team: {team_id}")
+                    members = team_doc.reference.collection('members').stream()
+                    for member_doc in members:
+                        member_data = member_doc.to_dict()
+                        member_id   = member_doc.id
+                        name        = member_data.get('name', member_id)
+                        email       = member_data.get('email', '')
+                        profiles    = member_data.get('profiles', {})
+                        print(f"      👤 Scraping {name}...")
+                        lc_total = get_leetcode_total(profiles.get('leetcode_url', ''));    time.sleep(uniform(1.0, 2.0))
+                        # Prevent SkillRack regressions and add mirror fallback
+                        today = datetime.now().strftime("%Y-%m-%d")
+                        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+                        member_key = member_doc.reference.path
+                        y_data = history.get(member_key, yesterday)
+                        if y_data is None:
+                            # Not mirrored locally yet; fall back to one Firestore read
+                            try:
+                                y_doc = member_doc.reference.collection('daily_totals').document(yesterday).get()
+                                if y_doc.exists:
+                                    y_data = y_doc.to_dict()
+                                    history.record(member_key, yesterday, y_data)
+                            except Exception:
+                                pass
+                        floor = y_data or history.last_known(member_key, today) or {}
+                        last_known_sr = int(floor.get('skillrack_total', 0))
+                        sr_total = get_skillrack_total_resilient(profiles.get('skillrack_url', ''), last_known=last_known_sr); time.sleep(uniform(1.0, 2.0))
+                        cc_total = get_codechef_solved(profiles.get('codechef_url', ''));  time.sleep(uniform(1.0, 2.0))
+                        hr_total = get_hackerrank_solved(profiles.get('hackerrank_url', '')); time.sleep(uniform(1.0, 2.0))
+                        gh_repos = get_github_repo_count(profiles.get('github_url', ''))
+                        print(f"         LC: {lc_total} | SR: {sr_total} | CC: {cc_total} | HR: {hr_total} | GH: {gh_repos}")
+                        lc_diff = sr_diff = cc_diff = hr_diff = gh_diff = 0
+                        if y_data:
                             lc_diff = max(0, lc_total - y_data.get('leetcode_total', 0))
                             sr_diff = max(0, sr_total - y_data.get('skillrack_total', 0))
                             cc_diff = max(0, cc_total - y_data.get('codechef_total', 0))
                             hr_diff = max(0, hr_total - y_data.get('hackerrank_total', 0))
                             gh_diff = max(0, gh_repos - y_data.get('github_repos', 0))
-                    except Exception:
-                        pass
-                    daily_data = {
-                        'date': today,
-                        'leetcode_total': lc_total,
-                        'skillrack_total': sr_total,
-                        'codechef_total': cc_total,
-                        'hackerrank_total': hr_total,
-                        'github_repos': gh_repos,
-                        'leetcode_daily_increase': lc_diff,
-                        'skillrack_daily_increase': sr_diff,
-                        'codechef_daily_increase': cc_diff,
-                        'hackerrank_daily_increase': hr_diff,
-                        'github_daily_increase': gh_diff,
-                        'scraped_at': datetime.now()
-                    }
-                    #member_doc.reference.collection('daily_totals').document(today).set(daily_data)
-                    # if email and from_email and app_password:
-                    #     subject = f"🚀 Your Daily Coding Report - {datetime.now().strftime('%b %d')}"
-                    #     send_email_summary(email, subject, "", from_email, app_password, name, daily_data)
-                    total_members_scraped += 1
-                    print(f"         ✅ Saved to Firebase")
+                        daily_data = {
+                            'date': today,
+                            'leetcode_total': lc_total,
+                            'skillrack_total': sr_total,
+                            'codechef_total': cc_total,
+                            'hackerrank_total': hr_total,
+                            'github_repos': gh_repos,
+                            'leetcode_daily_increase': lc_diff,
+                            'skillrack_daily_increase': sr_diff,
+                            'codechef_daily_increase': cc_diff,
+                            'hackerrank_daily_increase': hr_diff,
+                            'github_daily_increase': gh_diff,
+                            'scraped_at': datetime.now()
+                        }
+                        member_doc.reference.collection('daily_totals').document(today).set(daily_data)
+                        history.record(member_key, today, daily_data)
+                        # if email and from_email and app_password:
+                        #     subject = f"🚀 Your Daily Coding Report - {datetime.now().strftime('%b %d')}"
+                        #     send_email_summary(email, subject, "", from_email, app_password, name, daily_data)
+                        total_members_scraped += 1
+                        print(f"         ✅ Saved to Firebase")
     print("\n" + "="*60)
     print(f"🎉 SCRAPING COMPLETE! Processed {total_members_scraped} members")
     print("="*60 + "\n")
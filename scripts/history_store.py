@@ -0,0 +1,168 @@
+"""Local mirror of members/<id>/daily_totals/<date> for fast history queries.
+
+One SQLite table keyed by (member, day) holding the integer totals per
+platform. The table is clustered on that key, so point lookups, `last_known`
+floors and date-range scans are single index seeks served from a
+memory-mapped file instead of Firestore document reads.
+
+Firestore stays the source of truth: the scraper records a day locally only
+after writing it to Firestore, and each run first backfills whatever the
+local file is missing, so a lost or stale copy can always be rebuilt.
+"""
+import os
+import sqlite3
+
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", "history.sqlite3")
+
+# Firestore daily_totals keys mirrored locally, in column order
+TOTAL_FIELDS = ('leetcode_total', 'skillrack_total', 'codechef_total', 'hackerrank_total', 'github_repos')
+
+_MMAP_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS daily_totals (
+    member TEXT NOT NULL,
+    day    TEXT NOT NULL,
+    {', '.join(f'{f} INTEGER NOT NULL DEFAULT 0' for f in TOTAL_FIELDS)},
+    PRIMARY KEY (member, day)
+) WITHOUT ROWID
+"""
+
+_COLUMNS = ', '.join(TOTAL_FIELDS)
+
+
+class HistoryStore:
+    """SQLite-backed daily totals keyed by member document path and ISO date."""
+
+    def __init__(self, path: str = HISTORY_DB_PATH, readonly: bool = False):
+        self.path = path
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        else:
+            self.conn = sqlite3.connect(path)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(_SCHEMA)
+            self.conn.commit()
+        self.conn.execute(f"PRAGMA mmap_size={_MMAP_BYTES}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM daily_totals LIMIT 1").fetchone() is None
+
+    def newest_day(self) -> str | None:
+        return self.conn.execute("SELECT MAX(day) FROM daily_totals").fetchone()[0]
+
+    # ----- writes -----
+
+    def record(self, member: str, day: str, totals: dict, commit: bool = True):
+        """Stores one member-day; a rerun on the same day replaces the row."""
+        values = [int(totals.get(f) or 0) for f in TOTAL_FIELDS]
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO daily_totals (member, day, {_COLUMNS}) "
+            f"VALUES (?, ?, {', '.join('?' * len(TOTAL_FIELDS))})",
+            (member, day, *values),
+        )
+        if commit:
+            self.conn.commit()
+
+    def commit(self):
+        self.conn.commit()
+
+    # ----- reads -----
+
+    def _row_to_dict(self, row) -> dict | None:
+        if row is None:
+            return None
+        return {'date': row[0], **dict(zip(TOTAL_FIELDS, row[1:]))}
+
+    def get(self, member: str, day: str) -> dict | None:
+        row = self.conn.execute(
+            f"SELECT day, {_COLUMNS} FROM daily_totals WHERE member = ? AND day = ?",
+            (member, day),
+        ).fetchone()
+        return self._row_to_dict(row)
+
+    def last_known(self, member: str, before_day: str) -> dict | None:
+        """Most recent totals strictly before `before_day`, however old."""
+        row = self.conn.execute(
+            f"SELECT day, {_COLUMNS} FROM daily_totals WHERE member = ? AND day < ? "
+            f"ORDER BY day DESC LIMIT 1",
+            (member, before_day),
+        ).fetchone()
+        return self._row_to_dict(row)
+
+    def range(self, member: str, start_day: str, end_day: str) -> list[dict]:
+        """All stored days for a member within [start_day, end_day], oldest first."""
+        rows = self.conn.execute(
+            f"SELECT day, {_COLUMNS} FROM daily_totals WHERE member = ? AND day BETWEEN ? AND ? "
+            f"ORDER BY day",
+            (member, start_day, end_day),
+        ).fetchall()
+        return [self._row_to_dict(r) for r in rows]
+
+    def diffs(self, member: str, start_day: str, end_day: str) -> dict:
+        """Per-platform growth between the first and last stored day in range."""
+        rows = self.range(member, start_day, end_day)
+        if len(rows) < 2:
+            return {f: 0 for f in TOTAL_FIELDS}
+        first, last = rows[0], rows[-1]
+        return {f: max(0, last[f] - first[f]) for f in TOTAL_FIELDS}
+
+
+def backfill_from_firestore(db, store: HistoryStore) -> int:
+    """Copies daily_totals docs into the local store with one collection-group query.
+
+    Only days from the newest one already stored onward are fetched, so a
+    store restored from an older cache catches up instead of staying stale.
+    The date filter needs the collection-group single-field index on `date`;
+    without it the whole collection group is re-read.
+    """
+    since = store.newest_day()
+    print(f"🔄 Backfilling local history from Firestore (since {since or 'the beginning'})...")
+    query = db.collection_group('daily_totals')
+    count = 0
+    try:
+        docs = query.where('date', '>=', since).stream() if since else query.stream()
+        count = _copy_docs(docs, store)
+    except Exception as e:
+        if not since:
+            raise
+        print(f"⚠ Incremental backfill failed ({e}); re-reading all daily totals")
+        count = _copy_docs(query.stream(), store)
+    store.commit()
+    print(f"📊 Backfilled {count} daily totals")
+    return count
+
+
+def _copy_docs(docs, store: HistoryStore) -> int:
+    count = 0
+    for doc in docs:
+        member_ref = doc.reference.parent.parent
+        if member_ref is None:
+            continue
+        data = doc.to_dict() or {}
+        store.record(member_ref.path, data.get('date', doc.id), data, commit=False)
+        count += 1
+    return count
+
+
+if __name__ == "__main__":
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    try:
+        firebase_admin.get_app()
+    except ValueError:
+        cred_path = os.getenv('FIREBASE_CREDENTIALS_PATH', 'coding-team-profiles-2b0b4df65b4a.json')
+        firebase_admin.initialize_app(credentials.Certificate(cred_path))
+
+    with HistoryStore() as store:
+        backfill_from_firestore(firestore.client(), store)
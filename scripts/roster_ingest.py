@@ -0,0 +1,164 @@
+"""Roster ingestion for the team registration sheet.
+
+Resolves the sheet's header schema once, normalizes whole columns with
+vectorized pandas string ops and emits compact, deduplicated member records
+ready to be written to Firestore.
+"""
+from typing import NamedTuple
+
+import pandas as pd
+
+# Field -> accepted sheet headers, in priority order (first present column wins)
+COLUMN_ALIASES = {
+    'full_name':      ['Full Name', 'Name'],
+    'email':          ['Email Address', 'Email ID'],
+    'dept':           ['Department'],
+    'section':        ['Section'],
+    'team_name':      ['Team Name'],
+    'team_lead':      ['Team Lead'],
+    'batch':          ['Batch'],
+    'leetcode_url':   ['LeetCode Profile URL', 'LeetCode ID (eg: Gfz6n0WdOg or https://leetcode.com/u/Gfz6n0WdOg/)'],
+    'skillrack_url':  ['SkillRack Profile URL', 'Skillrack Profile URL'],
+    'codechef_url':   ['CodeChef Profile URL'],
+    'hackerrank_url': ['HackerRank Profile URL', 'Hackerrank Profile URL'],
+    'github_url':     ['GitHub Profile URL'],
+}
+
+# Values used when the column is missing or the cell is blank
+FIELD_DEFAULTS = {
+    'dept': 'AIML',
+    'section': 'A',
+    'team_name': 'ByteBreakers',
+}
+
+PLATFORMS = ('leetcode', 'skillrack', 'codechef', 'hackerrank', 'github')
+
+_SKILLRACK_RE = r'(?i)(?:skillrack\.com|skillrack\.gururaja\.in)/(?:profile/)?([^/?#]+)'
+_LEETCODE_RE = r'/u/([^/]+)/?'
+
+
+class MemberRecord(NamedTuple):
+    member_id: str
+    dept_id: str
+    section_id: str
+    team_id: str
+    full_name: str
+    email: str
+    dept: str
+    section: str
+    team_name: str
+    team_lead: str
+    batch: str
+    is_team_lead: bool
+    leetcode_url: str
+    skillrack_url: str
+    codechef_url: str
+    hackerrank_url: str
+    github_url: str
+    leetcode_username: str | None
+    skillrack_username: str | None
+    codechef_username: str | None
+    hackerrank_username: str | None
+    github_username: str | None
+
+    @property
+    def team_display_name(self) -> str:
+        return f"{self.team_name} - {self.team_lead}"
+
+    def profiles(self) -> dict:
+        return {f'{p}_url': getattr(self, f'{p}_url') for p in PLATFORMS}
+
+    def usernames(self) -> dict:
+        return {p: getattr(self, f'{p}_username') for p in PLATFORMS}
+
+
+def resolve_schema(columns) -> dict:
+    """Maps each roster field to the sheet column that backs it (or None)."""
+    present = {str(c).strip(): c for c in columns}
+    schema = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        schema[field] = next((present[a] for a in aliases if a in present), None)
+    return schema
+
+
+def _text_column(df: pd.DataFrame, column, default: str = '') -> pd.Series:
+    if column is None:
+        return pd.Series(default, index=df.index, dtype=object)
+    col = df[column]
+    # A blank cell turns a numeric column into floats; keep 2024 as '2024', not '2024.0'
+    if pd.api.types.is_float_dtype(col) and (col.dropna() % 1 == 0).all():
+        col = col.astype('Int64')
+    s = col.astype(object).fillna('').astype(str).str.strip()
+    if default:
+        s = s.mask(s == '', default)
+    return s
+
+
+def sanitize_urls(urls: pd.Series) -> pd.Series:
+    """Column-wise equivalent of the scraper's _sanitize_url."""
+    s = urls.str.strip()
+    # Two links pasted into one cell: keep everything before the second 'http'
+    glued = s.str.find('http', 10) > 0
+    s = s.mask(glued, s.str.replace(r'(?s)^(.*?http.*?)http.*$', r'\1', regex=True))
+    return s.str.replace(r'(?s)%20.*$', '', regex=True).str.strip()
+
+
+def _last_path_segment(s: pd.Series) -> pd.Series:
+    return s.str.rstrip('/').str.split('/').str[-1].fillna('')
+
+
+def extract_usernames(platform: str, urls: pd.Series) -> pd.Series:
+    """Vectorized username extraction; blank where none can be derived."""
+    is_url = urls.str.startswith('http')
+    if platform == 'leetcode':
+        from_url = urls.str.extract(_LEETCODE_RE, expand=False).fillna('')
+        return from_url.where(is_url, urls)
+    if platform == 'skillrack':
+        from_url = urls.str.extract(_SKILLRACK_RE, expand=False)
+        from_url = from_url.fillna(_last_path_segment(urls))
+        return from_url.where(is_url, urls)
+    domain = {'codechef': 'codechef.com', 'hackerrank': 'hackerrank.com', 'github': 'github.com'}[platform]
+    return _last_path_segment(urls).where(urls.str.contains(domain, regex=False), urls)
+
+
+def normalize_roster(df: pd.DataFrame) -> pd.DataFrame:
+    """Returns one normalized row per unique member; unusable rows are dropped.
+
+    Rows without a name are ignored; rows without a team lead are reported and
+    skipped. Duplicate submissions collapse onto the last one, which is what
+    the sheet order means for re-registrations.
+    """
+    schema = resolve_schema(df.columns)
+    out = pd.DataFrame(index=df.index)
+    for field, column in schema.items():
+        out[field] = _text_column(df, column, FIELD_DEFAULTS.get(field, ''))
+
+    out = out[out['full_name'] != '']
+    no_lead = out['team_lead'] == ''
+    for name in out.loc[no_lead, 'full_name']:
+        print(f"⚠ Skipping {name} - no team lead assigned")
+    out = out[~no_lead]
+
+    for p in PLATFORMS:
+        out[f'{p}_url'] = sanitize_urls(out[f'{p}_url'])
+        out[f'{p}_username'] = extract_usernames(p, out[f'{p}_url'])
+
+    out['member_id'] = out['full_name'].str.replace(' ', '_', regex=False)
+    out['dept_id'] = out['dept'].str.upper()
+    out['section_id'] = 'Section_' + out['section'].str.upper()
+    out['team_id'] = (out['team_name'] + '_' + out['team_lead']).str.replace(' ', '_', regex=False)
+    out['is_team_lead'] = out['full_name'].str.lower() == out['team_lead'].str.lower()
+
+    return out.drop_duplicates(subset=['dept_id', 'section_id', 'team_id', 'member_id'], keep='last')
+
+
+def ingest_roster(df: pd.DataFrame) -> list[MemberRecord]:
+    """Normalizes a raw registration sheet into MemberRecords."""
+    if df is None or df.empty:
+        return []
+    out = normalize_roster(df)
+    for p in PLATFORMS:
+        col = out[f'{p}_username'].astype(object)
+        out[f'{p}_username'] = col.where(col != '', None)
+    columns = [out[f].tolist() for f in MemberRecord._fields]
+    return [MemberRecord(*values) for values in zip(*columns)]